@@ -3,7 +3,10 @@
 """This module deploys VFX/ADR text detection program."""
 
 import logging
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # from gui import AppGui
 from PySide6.QtWidgets import QApplication
@@ -62,25 +65,40 @@ def main() -> None:
         f"{files_path}/temp/thumbnails",
         f"{files_path}/temp/first_last_scene_frames",
     )
+    # Tesseract runs are spread over threads, one core per Tesseract
+    # process works better than each of them starting its own OpenMP
+    # threads. The Tesseract processes inherit the environment.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
     text_recognition = TextRecognition(
         cv2_cap_obj, files_path, video, start_time, text_area, tc_area
     )
-    frames_with_embedded_text_id = (
-        text_recognition.generate_imgs_with_text_from_video()
-    )
-    logging.debug(
-        f"frames_with_embedded_text_id=\n{frames_with_embedded_text_id}\n"
-    )
-    scene_list = detect_all_scenes(video)
+    # Scene detection decodes the video on its own, so run it
+    # alongside the text extraction pass instead of after it. It prints
+    # nothing from the worker, the text extraction progress bar is shown
+    # meanwhile.
+    print("\n-Detecting scenes-")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        scene_list_future = executor.submit(
+            detect_all_scenes, video, show_progress=False
+        )
+        frames_with_embedded_text_id = (
+            text_recognition.generate_imgs_with_text_from_video()
+        )
+        logging.debug(
+            "frames_with_embedded_text_id=\n%s\n",
+            frames_with_embedded_text_id,
+        )
+        scene_list = scene_list_future.result()
     print("finished scene list")
-    logging.debug(f"scene_list=\n{scene_list}\n")
+    logging.debug("scene_list=\n%s\n", scene_list)
     frames_ranges_with_potential_text = (
         text_recognition.check_if_scenes_can_contain_text(
             scene_list, frames_with_embedded_text_id
         )
     )
     logging.debug(
-        f"frames_ranges_with_potential_text=\n{frames_ranges_with_potential_text}\n"
+        "frames_ranges_with_potential_text=\n%s\n",
+        frames_ranges_with_potential_text,
     )
     text_recognition.generate_pictures_for_each_scene(
         frames_ranges_with_potential_text
@@ -88,27 +106,33 @@ def main() -> None:
     found_vfx_text = text_recognition.generate_vfx_text(
         frames_ranges_with_potential_text, frames_with_embedded_text_id
     )
-    logging.debug(f"found_vfx_text=\n{found_vfx_text}\n")
+    logging.debug("found_vfx_text=\n%s\n", found_vfx_text)
 
     found_adr_text = text_recognition.generate_adr_text(
         frames_with_embedded_text_id
     )
-    logging.debug(f"found_adr_text=\n{found_adr_text}\n")
+    logging.debug("found_adr_text=\n%s\n", found_adr_text)
 
     merged_text_dict = text_recognition.merge_dicts(
         found_vfx_text, found_adr_text
     )
-    logging.debug(f"merged_text_dict=\n{merged_text_dict}\n")
+    logging.debug("merged_text_dict=\n%s\n", merged_text_dict)
 
     final_text_dict = text_recognition.add_real_timestamps(merged_text_dict)
-    logging.debug(f"final_text_dict=\n{final_text_dict}\n")
+    logging.debug("final_text_dict=\n%s\n", final_text_dict)
 
     df = create_dataframe(final_text_dict)
     create_xlsx_file(df, video, files_path, save_hq_pics)
-    delete_folder(f"{files_path}/temp")
+    # Removing thousands of temporary pictures can take a while,
+    # so do it in the background while the user reads the prompt.
+    cleanup_thread = threading.Thread(
+        target=delete_folder, args=(f"{files_path}/temp",)
+    )
+    cleanup_thread.start()
     delete_logging_file(video, files_path)
 
     input("Done.\n\nPress Enter to exit: ")
+    cleanup_thread.join()
     sys.exit()
 
 
@@ -1,8 +1,11 @@
-from collections import deque
+import functools
 import signal
+import threading
 import cv2
+import numpy as np
 import sys
 import os
+from collections import OrderedDict
 
 from PySide6.QtWidgets import (
     QApplication,
@@ -28,6 +31,7 @@ from PySide6.QtCore import (
     QSize,
     QRect,
     QPoint,
+    QTimer,
 )
 from PySide6.QtGui import (
     QImage,
@@ -46,63 +50,245 @@ pyqt_signal = Signal
 pyqt_slot = Slot
 
 
+def open_video_capture(video_path):
+    # Ask FFmpeg for hardware decoding, fall back to the default backend
+    cap = cv2.VideoCapture(
+        video_path,
+        cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+    )
+    if not cap.isOpened():
+        cap.release()
+        cap = cv2.VideoCapture(video_path)
+    return cap
+
+
+def probe_video_capture(cap):
+    # Read once per opened file, then passed along with the capture
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return width, height, frame_count, fps
+
+
 class Thread(QThread):
     change_pixmap = pyqt_signal(QImage)
+    # Short forward jumps are cheaper to decode through than to seek
+    max_frames_to_grab = 30
+    # Display-sized images kept for frames revisited while scrubbing,
+    # bounded by size, a maximized 1080p label takes about 6 MB per image
+    max_cached_bytes = 64 * 1024 * 1024
 
     def __init__(self, cap, parent=None):
         super(Thread, self).__init__(parent)
-        self.frame_queue = deque(maxlen=1)  # Queue to hold frame numbers
+        # Only the newest request is kept, a None frame number stops
+        # the thread
+        self.request_condition = threading.Condition()
+        self.pending_request = None
         self.cap = cap
-        self.first_frame = True
-        self.h, self.w, self.ch, self.bytes_per_line = 0, 0, 0, 0
+        self.target_size = None  # Size of the label the frames are shown in
+        self.interpolation = cv2.INTER_AREA
+        # Decoded frame kept for redraws that only change the scaling
+        self.last_frame_number = None
+        self.last_frame = None
+        # Decoded into instead of allocating a new frame for every read
+        self.spare_frame = None
+        self.image_cache = OrderedDict()
+        self.cached_bytes = 0
 
     def run(self):
-        while self.frame_queue:
-            frame_number = (
-                self.frame_queue.popleft()
-            )  # Get the oldest frame number
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = self.cap.read()
-            if ret:
-                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                if self.first_frame:
-                    self.h, self.w, self.ch = rgb_image.shape
-                    self.bytes_per_line = self.ch * self.w
-                    self.first_frame = False
-                convert_to_qt_format = QImage(
-                    rgb_image.data,
-                    self.w,
-                    self.h,
-                    self.bytes_per_line,
-                    QImage.Format_RGB888,
+        while True:
+            with self.request_condition:
+                # Blocks until requested
+                while self.pending_request is None:
+                    self.request_condition.wait()
+                frame_number, exact = self.pending_request
+                self.pending_request = None
+            if frame_number is None:
+                break
+            # Read once, the GUI thread can change them while this frame is
+            # being scaled, and the cache key has to match the image
+            target_size = self.target_size
+            interpolation = self.interpolation
+            cache_key = self.cacheKey(frame_number, target_size, interpolation)
+            image = self.image_cache.get(cache_key)
+            if image is not None:
+                self.image_cache.move_to_end(cache_key)
+            else:
+                image = self.loadImage(
+                    frame_number, exact, target_size, interpolation
                 )
-                # p = convert_to_qt_format.scaled(1280, 720, Qt.KeepAspectRatio)
-                self.change_pixmap.emit(convert_to_qt_format)
+            if image is not None:
+                self.change_pixmap.emit(image)
+
+    def cacheKey(self, frame_number, target_size, interpolation):
+        if target_size is not None:
+            target_size = (target_size.width(), target_size.height())
+        return frame_number, target_size, interpolation
+
+    def loadImage(
+        self,
+        frame_number,
+        exact=True,
+        target_size=None,
+        interpolation=cv2.INTER_AREA,
+    ):
+        if frame_number == self.last_frame_number:
+            ret, frame = True, self.last_frame
+        else:
+            ret, frame = self.readFrame(frame_number, exact)
+            if not ret:
+                return None
+            # Not the requested frame if the read wasn't exact
+            self.last_frame_number = (
+                int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+            )
+            # The old last frame becomes the buffer for the next read
+            self.spare_frame, self.last_frame = self.last_frame, frame
+        cache_key = self.cacheKey(
+            self.last_frame_number, target_size, interpolation
+        )
+        image = self.fitToTargetSize(frame, target_size, interpolation)
+        # Scrub frames would only push out the smooth ones
+        if interpolation != cv2.INTER_NEAREST:
+            self.cacheImage(cache_key, image)
+        return image
+
+    def cacheImage(self, cache_key, image):
+        replaced = self.image_cache.pop(cache_key, None)
+        if replaced is not None:
+            self.cached_bytes -= replaced.sizeInBytes()
+        self.image_cache[cache_key] = image
+        self.cached_bytes += image.sizeInBytes()
+        while self.cached_bytes > self.max_cached_bytes:
+            _, evicted = self.image_cache.popitem(last=False)
+            self.cached_bytes -= evicted.sizeInBytes()
+
+    def fitToTargetSize(self, frame, target_size, interpolation):
+        # Downscale here so Qt only receives a display-sized image
+        h, w = frame.shape[:2]
+        fitted_size = QSize(w, h)
+        if target_size is not None:
+            scaled_size = fitted_size.scaled(target_size, Qt.KeepAspectRatio)
+            if scaled_size.width() < w and scaled_size.height() < h:
+                fitted_size = scaled_size
+        # Qt reads OpenCV's BGR layout directly, no cvtColor needed.
+        # The frame is written straight into the memory of the QImage,
+        # which owns it, so nothing has to be copied before it crosses
+        # to the GUI thread.
+        image = QImage(fitted_size, QImage.Format_BGR888)
+        image_array = np.ndarray(
+            (fitted_size.height(), fitted_size.width(), 3),
+            dtype=np.uint8,
+            buffer=image.bits(),
+            strides=(image.bytesPerLine(), 3, 1),
+        )
+        if fitted_size == QSize(w, h):
+            image_array[:] = frame
+        else:
+            cv2.resize(
+                frame,
+                (fitted_size.width(), fitted_size.height()),
+                dst=image_array,
+                interpolation=interpolation,
+            )
+        return image
+
+    def setTargetSize(self, size):
+        self.target_size = QSize(size)
+
+    def setScrubbing(self, scrubbing):
+        # Nobody sees the aliasing while the slider is being dragged
+        if scrubbing:
+            self.interpolation = cv2.INTER_NEAREST
+        else:
+            self.interpolation = cv2.INTER_AREA
+
+    def readFrame(self, frame_number, exact=True):
+        # Ask the capture where it is, it can be shared with other windows
+        frames_to_skip = frame_number - int(
+            self.cap.get(cv2.CAP_PROP_POS_FRAMES)
+        )
+        if (
+            not exact
+            and self.max_frames_to_grab
+            < frames_to_skip
+            <= 2 * self.max_frames_to_grab
+        ):
+            # While dragging forwards, a frame on the way to the target is
+            # close enough and cheaper than a seek. Targets behind the
+            # capture are always sought, so the preview never runs
+            # against the drag.
+            frames_to_skip = self.max_frames_to_grab
+        if 0 <= frames_to_skip <= self.max_frames_to_grab:
+            # Skipped frames are grabbed but never retrieved (converted)
+            for _ in range(frames_to_skip):
+                self.cap.grab()
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        # Never the last frame's buffer, it stays valid if the read fails
+        return self.cap.read(self.spare_frame)
 
-    def setFrameNumber(self, frame_number):
-        self.frame_queue.append(
-            frame_number
-        )  # Add new frame number to the queue
+    def setFrameNumber(self, frame_number, exact=True):
+        # Replace a frame number that wasn't decoded yet with the new one
+        with self.request_condition:
+            self.pending_request = (frame_number, exact)
+            self.request_condition.notify()
 
     def stop(self):
-        print("Thread is stopping")
-        self.isRunning = False
-        # self.cap.release()
-        self.quit()
-        self.terminate()
+        self.setFrameNumber(None)
+        # The loop exits on the None request; terminating a thread
+        # waiting on the condition would kill it inside the interpreter
+        self.wait()
+        # Nothing consumes the request when the thread wasn't running,
+        # it would stop the thread again as soon as it is restarted
+        with self.request_condition:
+            self.pending_request = None
+
+
+class FrameLabel(QLabel):
+    # Paints the rectangle that is being drawn on top of the pixmap,
+    # so the pixmap itself doesn't have to change on every mouse move
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rubber_band = None
+        self.rubber_band_pen = None
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.rubber_band is not None:
+            painter = QPainter(self)
+            painter.setPen(self.rubber_band_pen)
+            painter.drawRect(self.rubber_band)
+            painter.end()
 
 
 class VideoContainer(QWidget):
-    def __init__(self, video_path, start_frame=0, parent_window=None):
+    def __init__(
+        self,
+        video_path,
+        start_frame=0,
+        parent_window=None,
+        cap=None,
+        video_properties=None,
+    ):
         super().__init__()
         self.video_path = video_path
         self.start_frame = start_frame
         self.parent_window = parent_window
-        self.cap = cv2.VideoCapture(self.video_path)
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Reuse the capture of the parent window instead of opening the
+        # video again
+        self.cap = cap if cap is not None else open_video_capture(video_path)
+        if video_properties is None:
+            video_properties = probe_video_capture(self.cap)
+        (
+            self.image_width,
+            self.image_height,
+            self.total_frames,
+            _,
+        ) = video_properties
         # self.cap.release()
-        self.image_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        self.image_height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
         # self.resize(1200, 800)
         # screen = QGuiApplication.primaryScreen().availableGeometry()
         # print(f"Screen width: {screen.width()}, height: {screen.height()}")
@@ -113,9 +299,22 @@ class VideoContainer(QWidget):
         self.resize(1280, 720)
         self.start_point = None
         self.end_point = None
+        self.frame_number = start_frame
         self.rectangles = {}
         self.text_areas = {}
-        self.first_time = True
+        # Set from the first image the thread delivers, until then the
+        # mouse handlers have nothing to map points onto
+        self.clean_image = None
+        self.pixmap_rect = QRect()
+        self.label_to_image = np.array([[1, 0, 0], [0, 1, 0]])
+        # Pens are reused for every repaint while drawing
+        self.pens = {
+            "VFX/ADR": QPen(Qt.green, 2, Qt.SolidLine),
+            "TC": QPen(Qt.blue, 2, Qt.SolidLine),
+        }
+        for pen in self.pens.values():
+            # Keep the line width in screen pixels when the painter scales
+            pen.setCosmetic(True)
         self.init_ui()
         self.is_drawing = False
         self.button_1_clicked = False
@@ -129,25 +328,59 @@ class VideoContainer(QWidget):
             label_size = self.label.size()
             # print(f"{label_size}=")
             # Fresh image from slider
-            scaled_image = image.scaled(
-                label_size.width(),
-                label_size.height(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
-            self.image = QPixmap.fromImage(scaled_image)
-            self.clean_image = self.image.copy()
-            self.try_draw_rectangles(self.image)
+            if image.size() == image.size().scaled(
+                label_size, Qt.KeepAspectRatio
+            ):
+                # Already downscaled by the thread
+                scaled_image = image
+            else:
+                scaled_image = image.scaled(
+                    label_size.width(),
+                    label_size.height(),
+                    Qt.KeepAspectRatio,
+                    Qt.SmoothTransformation,
+                )
+            # Never painted on, copied only when there are rectangles
+            self.clean_image = QPixmap.fromImage(scaled_image)
+            # Mouse handlers reuse these until the next image or resize
+            self.pixmap_rect = QRect(QPoint(0, 0), self.clean_image.size())
+            self.pixmap_rect.moveCenter(self.label.rect().center())
+            self.label_to_image = self.calculate_label_to_image(label_size)
+            self.image = self.try_draw_rectangles()
             # update image
             self.label.setPixmap(self.image)
 
-    def changeFrame(self, value):
+    def changeFrame(self, value, exact=True):
+        self.frame_number = value
         self.thread.setFrameNumber(
-            value
+            value, exact
         )  # Pass the slider value to the thread
-        if self.first_time:
-            self.thread.start()
-            self.first_time = False
+
+    def startScrubbing(self):
+        self.smooth_frame_timer.stop()
+        self.thread.setScrubbing(True)
+
+    def stopScrubbing(self):
+        # Wait for the drag to settle before the smooth redraw
+        self.smooth_frame_timer.start()
+
+    def redrawSmooth(self):
+        self.thread.setScrubbing(False)
+        self.changeFrame(self.frame_number)
+
+    def stopPreview(self):
+        # Windows are hidden and replaced, not deleted, so the thread has
+        # to end with its window rather than when the app quits
+        self.smooth_frame_timer.stop()
+        self.thread.stop()
+
+    def resumePreview(self):
+        if self.thread.isRunning():
+            return
+        self.thread.setScrubbing(False)
+        # Queued first, so the thread has a frame to read when it starts
+        self.changeFrame(self.frame_number)
+        self.thread.start()
 
     def init_ui(self):
         # self.resize(1200, 800)
@@ -156,7 +389,7 @@ class VideoContainer(QWidget):
         # max_width = screen.width() * 0.2
         # max_height = screen.height() * 0.2
 
-        self.label = QLabel(self)
+        self.label = FrameLabel(self)
         # self.label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.label.setMinimumSize(1280, 720)
         self.label.resize(1280, 720)
@@ -164,103 +397,120 @@ class VideoContainer(QWidget):
         layout = QVBoxLayout(self)
         layout.addWidget(self.label)
         # self.label.resize(min(self.image_width, max_width), min(self.image_height, max_height))
+        self.smooth_frame_timer = QTimer(self)
+        self.smooth_frame_timer.setSingleShot(True)
+        self.smooth_frame_timer.setInterval(100)
+        self.smooth_frame_timer.timeout.connect(self.redrawSmooth)
         self.thread = Thread(self.cap, self)
+        self.thread.setTargetSize(self.label.size())
         self.thread.change_pixmap.connect(self.setImage)
+        QApplication.instance().aboutToQuit.connect(self.thread.stop)
+        self.thread.start()
         self.changeFrame(self.start_frame)  # Start with frame 0
         self.setLayout(layout)
         self.show()
 
     def resizeEvent(self, event):
         # Update UI elements based on the new size
-        if self.label.pixmap() is not None:
-            self.setImage(self.label.pixmap().toImage())
+        self.thread.setTargetSize(self.label.size())
+        # The thread rescales its last decoded frame to the new size
+        self.changeFrame(self.frame_number)
 
     def mousePressEvent(self, event):
+        if self.clean_image is None:
+            return
         if (
             self.button_1_clicked or self.button_2_clicked
         ) and event.button() == Qt.LeftButton:
             if self.label.geometry().contains(event.position().toPoint()):
                 adjusted_point = event.position() - self.label.pos()
-                constrained_point = self.constrainPointToImageBounds(
+                self.start_point = self.constrainPointToImageBounds(
                     adjusted_point.toPoint()
                 )
-                self.start_point = self.adjustPointForScaling(
-                    constrained_point
-                )
                 self.end_point = self.start_point
                 self.is_drawing = True
-                self.update()
+                self.updateRubberBand()
 
     def mouseMoveEvent(self, event):
         if (
             self.button_1_clicked or self.button_2_clicked
         ) and self.is_drawing:
             adjusted_point = event.position() - self.label.pos()
-            constrained_point = self.constrainPointToImageBounds(
+            self.end_point = self.constrainPointToImageBounds(
                 adjusted_point.toPoint()
             )
-            self.end_point = self.adjustPointForScaling(constrained_point)
-            self.update()
+            self.updateRubberBand()
 
     def mouseReleaseEvent(self, event):
         if (
-            self.button_1_clicked or self.button_2_clicked
-        ) and event.button() == Qt.LeftButton:
+            (self.button_1_clicked or self.button_2_clicked)
+            and event.button() == Qt.LeftButton
+            and self.is_drawing
+        ):
             adjusted_point = event.position() - self.label.pos()
-            constrained_point = self.constrainPointToImageBounds(
+            self.end_point = self.constrainPointToImageBounds(
                 adjusted_point.toPoint()
             )
-            self.end_point = self.adjustPointForScaling(constrained_point)
             self.is_drawing = False
-            self.update()
-            rect = QRect(self.start_point, self.end_point)
+            self.label.rubber_band = None
+            # Stored in video coordinates so they survive label resizes
+            corners = self.calculate_rectangle_corners()
+            rect = QRect(QPoint(*corners[0]), QPoint(*corners[2]))
             if self.button_1_clicked:
                 self.rectangles["VFX/ADR"] = rect
-                self.text_areas["VFX/ADR"] = self.calculate_rectangle_corners()
+                self.text_areas["VFX/ADR"] = corners
             elif self.button_2_clicked:
                 self.rectangles["TC"] = rect
-                self.text_areas["TC"] = self.calculate_rectangle_corners()
+                self.text_areas["TC"] = corners
+            # Draw the finished rectangle into the displayed pixmap once
+            self.image = self.try_draw_rectangles()
+            self.label.setPixmap(self.image)
             # print(self.calculate_rectangle_corners())
             self.button_1_clicked = False
             self.button_2_clicked = False
             self.parent_window.button1.setEnabled(True)
             self.parent_window.button2.setEnabled(True)
 
-    def adjustPointForScaling(self, point):
-        label_size = self.label.size()
-        image_size = self.image.size()
-        scale_x = image_size.width() / label_size.width()
-        scale_y = image_size.height() / label_size.height()
-        return QPoint(int(point.x() * scale_x), int(point.y() * scale_y))
-
-    def paintEvent(self, event):
-        if self.is_drawing:
-            temp_image = self.clean_image.copy()
-            self.try_draw_rectangles(temp_image)
-            temp_painter = QPainter(temp_image)
-            if self.button_1_clicked:
-                temp_painter.setPen(QPen(Qt.green, 2, Qt.SolidLine))
-            elif self.button_2_clicked:
-                temp_painter.setPen(QPen(Qt.blue, 2, Qt.SolidLine))
-            rect = QRect(self.start_point, self.end_point)
-            temp_painter.drawRect(rect)
-            temp_painter.end()
-            self.label.setPixmap(temp_image)
-
-    def try_draw_rectangles(self, image):
-        if self.rectangles:
-            temp_painter = QPainter(image)
-            for key, value in self.rectangles.items():
-                if value is not None:
-                    if key == "VFX/ADR":
-                        temp_painter.setPen(QPen(Qt.green, 2, Qt.SolidLine))
-                    elif key == "TC":
-                        temp_painter.setPen(QPen(Qt.blue, 2, Qt.SolidLine))
-                    temp_painter.drawRect(value)
-            temp_painter.end()
+    def updateRubberBand(self):
+        rect = QRect(self.start_point, self.end_point)
+        if self.button_1_clicked:
+            self.label.rubber_band_pen = self.pens["VFX/ADR"]
+        elif self.button_2_clicked:
+            self.label.rubber_band_pen = self.pens["TC"]
+        # Only repaint the area covered by the old and the new rectangle
+        dirty_rect = rect.normalized()
+        if self.label.rubber_band is not None:
+            dirty_rect = dirty_rect.united(
+                self.label.rubber_band.normalized()
+            )
+        self.label.rubber_band = rect
+        self.label.update(dirty_rect.adjusted(-2, -2, 2, 2))
+
+    def try_draw_rectangles(self):
+        if self.clean_image is None:
+            return QPixmap()
+        # Without rectangles the clean pixmap is shown as is, no copy
+        if all(value is None for value in self.rectangles.values()):
+            return self.clean_image
+        image = self.clean_image.copy()
+        temp_painter = QPainter(image)
+        self.draw_rectangles(temp_painter)
+        temp_painter.end()
+        return image
+
+    def draw_rectangles(self, painter):
+        # Map video coordinates onto the displayed pixmap
+        painter.scale(
+            self.clean_image.width() / self.image_width,
+            self.clean_image.height() / self.image_height,
+        )
+        for key, value in self.rectangles.items():
+            if value is not None:
+                painter.setPen(self.pens[key])
+                painter.drawRect(value)
 
-    def calculate_rectangle_corners(self):
-        label_size = self.label.size()
+    def calculate_label_to_image(self, label_size):
+        # Affine transform from label coordinates to video frame coordinates
         image_size_width, image_size_height = (
             self.image_width,
             self.image_height,
@@ -276,17 +526,23 @@ class VideoContainer(QWidget):
         offset_x = (label_size.width() - image_size_width * scale_factor) / 2
         offset_y = (label_size.height() - image_size_height * scale_factor) / 2
 
-        # Adjust start and end points for scaling and offset
-        x1 = (self.start_point.x() - offset_x) / scale_factor
-        y1 = (self.start_point.y() - offset_y) / scale_factor
-        x2 = (self.end_point.x() - offset_x) / scale_factor
-        y2 = (self.end_point.y() - offset_y) / scale_factor
+        return np.array([
+            [1 / scale_factor, 0, -offset_x / scale_factor],
+            [0, 1 / scale_factor, -offset_y / scale_factor],
+        ])
 
-        # Ensure coordinates are within the bounds of the original image
-        x1 = max(0, min(x1, image_size_width))
-        y1 = max(0, min(y1, image_size_height))
-        x2 = max(0, min(x2, image_size_width))
-        y2 = max(0, min(y2, image_size_height))
+    def calculate_rectangle_corners(self):
+        # Map both points at once, one column per point
+        points = np.array([
+            [self.start_point.x(), self.end_point.x()],
+            [self.start_point.y(), self.end_point.y()],
+            [1, 1],
+        ])
+        (x1, x2), (y1, y2) = np.clip(
+            self.label_to_image @ points,
+            0,
+            [[self.image_width], [self.image_height]],
+        )
 
         # Calculate the true corners of the rectangle
         min_x = int(min(x1, x2))
@@ -326,24 +582,28 @@ class VideoContainer(QWidget):
         elif self.button_2_clicked:
             self.rectangles["TC"] = None
         # Optionally, if you're displaying the image on a QLabel
-        temp_image = self.clean_image.copy()
-        self.try_draw_rectangles(temp_image)
-        self.label.setPixmap(temp_image)
+        self.image = self.try_draw_rectangles()
+        self.label.setPixmap(self.image)
 
     def constrainPointToImageBounds(self, point):
-        label_size = self.label.size()
-        x = max(0, min(point.x(), label_size.width() - 1))
-        y = max(0, min(point.y(), label_size.height() - 1))
+        bounds = self.pixmap_rect
+        x = max(bounds.left(), min(point.x(), bounds.right()))
+        y = max(bounds.top(), min(point.y(), bounds.bottom()))
         return QPoint(x, y)
 
 
 class MainWindow(QWidget):
     data_signal = Signal(dict)  # Add this line
+    # Loaded once and shared, see loadImages()
+    title_logo_pixmap = None
+    dark_mode_icon = None
+    light_mode_icon = None
 
     def __init__(self, app):
         super().__init__()
         self.app = app
         self.file_name = None
+        self.loadImages()
         self.init_ui()
         self.toggleTheme()
         self.resize(800, 600)  # Set the initial size of the window to 800x600
@@ -360,6 +620,19 @@ class MainWindow(QWidget):
         geo.moveCenter(center)
         self.move(geo.topLeft())
 
+    @classmethod
+    def loadImages(cls):
+        # Pixmaps need a running QApplication, so they can't be loaded
+        # at import time
+        if cls.title_logo_pixmap is not None:
+            return
+        # Scale the logo to fit within 500x500, maintaining aspect ratio
+        cls.title_logo_pixmap = QPixmap(
+            "./resources/images/title_logo.jpeg"
+        ).scaled(500, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        cls.dark_mode_icon = QIcon("./resources/images/dark_mode.png")
+        cls.light_mode_icon = QIcon("./resources/images/light_mode.png")
+
     def init_ui(self):
         # Main layout
         layout = QVBoxLayout()
@@ -367,7 +640,7 @@ class MainWindow(QWidget):
         top_layout = QHBoxLayout()
         self.toggle_theme_button = QPushButton(self)
         self.toggle_theme_button.setIcon(
-            QIcon("./resources/images/dark_mode.png")
+            self.dark_mode_icon
         )  # Set the icon
         self.toggle_theme_button.setIconSize(
             QSize(30, 30)
@@ -391,16 +664,9 @@ class MainWindow(QWidget):
         welcome_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(welcome_label)
 
-        # Load the image
-        title_logo_pixmap = QPixmap("./resources/images/title_logo.jpeg")
-        # Scale the image to fit within 200x200 pixels, maintaining aspect ratio
-        scaled_pixmap = title_logo_pixmap.scaled(
-            500, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
-
         # Create a QLabel for the image
         title_logo_label = QLabel(self)
-        title_logo_label.setPixmap(scaled_pixmap)
+        title_logo_label.setPixmap(self.title_logo_pixmap)
         title_logo_label.setAlignment(Qt.AlignCenter)  # Center the image
 
         # Add the QLabel to the layout, below the welcome_label
@@ -546,14 +812,10 @@ class MainWindow(QWidget):
     def toggleTheme(self):
         if self.dark_mode:
             apply_dark_theme(self.app)
-            self.toggle_theme_button.setIcon(
-                QIcon("./resources/images/light_mode.png")
-            )
+            self.toggle_theme_button.setIcon(self.light_mode_icon)
         else:
             apply_light_theme(self.app)
-            self.toggle_theme_button.setIcon(
-                QIcon("./resources/images/dark_mode.png")
-            )
+            self.toggle_theme_button.setIcon(self.dark_mode_icon)
         self.dark_mode = not self.dark_mode
     
     def closeEvent(self, event):
@@ -581,15 +843,17 @@ class SecondWindow(QWidget):
         self.third_window = None
         self.video_path = video_path
         self.save_hq_pics = save_hq_pics
-        self.cap = cv2.VideoCapture(self.video_path)
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        self.video_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.cap = open_video_capture(self.video_path)
+        self.video_properties = probe_video_capture(self.cap)
+        _, _, self.total_frames, self.video_fps = self.video_properties
         # Get total frame count
         # self.cap.release()
         self.init_ui()
 
     def showEvent(self, event):
         self.centerWindow()
+        # Shown again when going back from the ThirdWindow
+        self.video_screen.resumePreview()
         super().showEvent(event)
 
     def centerWindow(self):
@@ -604,6 +868,12 @@ class SecondWindow(QWidget):
         layout = QVBoxLayout()
         self.setWindowTitle("Choose Video Start Point")
 
+        # Collapses bursts of slider moves into a single frame request
+        self.frame_request_timer = QTimer(self)
+        self.frame_request_timer.setSingleShot(True)
+        self.frame_request_timer.setInterval(50)
+        self.frame_request_timer.timeout.connect(self.requestFrame)
+
         # Button to go back to the main screen
         back_layout = QHBoxLayout()
         back_button = QPushButton("Back", self)
@@ -622,7 +892,12 @@ class SecondWindow(QWidget):
         text_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(text_label)
 
-        self.video_screen = VideoContainer(self.video_path, parent_window=self)
+        self.video_screen = VideoContainer(
+            self.video_path,
+            parent_window=self,
+            cap=self.cap,
+            video_properties=self.video_properties,
+        )
         layout.addWidget(self.video_screen)
 
         # screen = VideoContainer()
@@ -639,6 +914,9 @@ class SecondWindow(QWidget):
             self.total_frames - 1
         )  # Set slider maximum to total frame count
         self.slider.valueChanged[int].connect(self.changeFrame)
+        self.slider.sliderPressed.connect(self.video_screen.startScrubbing)
+        self.slider.sliderReleased.connect(self.video_screen.stopScrubbing)
+        self.slider.sliderReleased.connect(self.flushFrameRequest)
         right_label = QLabel(str(self.total_frames - 1))
         slider_layout.addWidget(left_label)
         slider_layout.addWidget(self.slider)
@@ -648,6 +926,8 @@ class SecondWindow(QWidget):
         # Label displayed above the slider
         self.slider_label = QLabel(self)
         self.slider_label.setAlignment(Qt.AlignCenter)
+        self.slider_label_width = None
+        self.cacheSliderGeometry()
 
         line_edit_HBoxLayout = QHBoxLayout()
         # Create QLineEdit for input
@@ -731,10 +1011,14 @@ class SecondWindow(QWidget):
         self.close()
 
     def go_to_third_screen(self):
+        # The capture is handed over, nothing here may read from it anymore
+        self.stopPreview()
         self.third_window = ThirdWindow(
             video_path=self.video_path,
             save_hq_pics=self.save_hq_pics,
             start_frame=self.slider.value(),
+            cap=self.cap,
+            video_properties=self.video_properties,
         )
         self.third_window.data_signal.connect(
             self.handle_data_from_third_window
@@ -746,6 +1030,16 @@ class SecondWindow(QWidget):
     def handle_data_from_third_window(self, data):
         self.data_signal.emit(data)  # Propagate the signal to MainWindow
 
+    def cacheSliderGeometry(self):
+        # Only changes on resize, not on every value change
+        self.slider_geometry = (
+            self.slider.x(),
+            self.slider.y(),
+            self.slider.width(),
+            self.slider.minimum(),
+            self.slider.maximum(),
+        )
+
     def update_slider_label_postion(self):
         value = self.slider.value()
         value_str = str(value)
@@ -753,33 +1047,51 @@ class SecondWindow(QWidget):
             30, 10 * len(value_str)
         )  # Example: base width of 30, plus 10 pixels per character
 
-        self.slider_label.setFixedWidth(label_width)
-        slider_width = self.slider.width()
-        min_value = self.slider.minimum()
-        max_value = self.slider.maximum()
+        if label_width != self.slider_label_width:
+            self.slider_label.setFixedWidth(label_width)
+            self.slider_label_width = label_width
+        slider_x, slider_y, slider_width, min_value, max_value = (
+            self.slider_geometry
+        )
         handle_x = (
             (value - min_value) / (max_value - min_value)
         ) * slider_width
         handle_width_estimate = 15
         label_x = (
-            self.slider.x()
+            slider_x
             + handle_x
             - (label_width // 2)
             + (handle_width_estimate // 2)
         )
-        label_y = self.slider.y() - 25
+        label_y = slider_y - 25
 
         self.slider_label.move(label_x, label_y)
         self.slider_label.setText(value_str)
 
     def resizeEvent(self, event):
+        self.cacheSliderGeometry()
         self.update_slider_label_postion()
         event.accept()  # Call the base class method to ensure the event is properly handled
 
     def changeFrame(self, value):
         self.update_slider_label_postion()
-        self.video_screen.thread.setFrameNumber(value)
-        self.video_screen.thread.start()
+        self.frame_request_timer.start()  # Restarts if already running
+
+    def requestFrame(self):
+        # Frames shown during a drag don't have to be exact
+        self.video_screen.changeFrame(
+            self.slider.value(), exact=not self.slider.isSliderDown()
+        )
+
+    def flushFrameRequest(self):
+        # Show the final position right away when the drag ends
+        self.frame_request_timer.stop()
+        self.requestFrame()
+
+    def stopPreview(self):
+        # A pending request would restart reading from the capture
+        self.frame_request_timer.stop()
+        self.video_screen.stopPreview()
 
     def closeEvent(self, event):
         if event.spontaneous():  # If triggered by the user
@@ -791,9 +1103,12 @@ class SecondWindow(QWidget):
                 QMessageBox.No,
             )
             if reply == QMessageBox.Yes:
+                self.stopPreview()
                 event.accept()
             else:
                 event.ignore()
+        else:
+            self.stopPreview()
 
 
 class ThirdWindow(QWidget):
@@ -802,16 +1117,24 @@ class ThirdWindow(QWidget):
     data_signal = Signal(dict)
 
     def __init__(
-        self, video_path, start_frame=0, save_hq_pics=False, parent=None
+        self,
+        video_path,
+        start_frame=0,
+        save_hq_pics=False,
+        parent=None,
+        cap=None,
+        video_properties=None,
     ):
         super().__init__(parent)
         self.video_path = video_path
         self.start_frame = start_frame
         self.save_hq_pics = save_hq_pics
-        self.cap = cv2.VideoCapture(self.video_path)
-        self.total_frames = int(
-            self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        )  # Get total frame count
+        # Shared with the SecondWindow, only used for the preview
+        self.cap = cap if cap is not None else open_video_capture(video_path)
+        if video_properties is None:
+            video_properties = probe_video_capture(self.cap)
+        self.video_properties = video_properties
+        _, _, self.total_frames, _ = self.video_properties
         self.init_ui()
         self.centerWindow()
         self.data = {}
@@ -832,6 +1155,12 @@ class ThirdWindow(QWidget):
         layout = QVBoxLayout()
         self.setWindowTitle("Set Video VFX/ADR and TC Regions")
 
+        # Collapses bursts of slider moves into a single frame request
+        self.frame_request_timer = QTimer(self)
+        self.frame_request_timer.setSingleShot(True)
+        self.frame_request_timer.setInterval(50)
+        self.frame_request_timer.timeout.connect(self.requestFrame)
+
         # Button to go back to the main screen
         back_layout = QHBoxLayout()
         back_button = QPushButton("Back", self)
@@ -850,7 +1179,11 @@ class ThirdWindow(QWidget):
         text_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(text_label)
         self.video_screen = VideoContainer(
-            self.video_path, start_frame=self.start_frame, parent_window=self
+            self.video_path,
+            start_frame=self.start_frame,
+            parent_window=self,
+            cap=self.cap,
+            video_properties=self.video_properties,
         )
         layout.addWidget(self.video_screen, alignment=Qt.AlignCenter)
         vertical_padding = QSpacerItem(20, 20, QSizePolicy.Minimum)
@@ -864,6 +1197,9 @@ class ThirdWindow(QWidget):
             self.total_frames - 1
         )  # Set slider maximum to total frame count
         self.slider.valueChanged[int].connect(self.changeFrame)
+        self.slider.sliderPressed.connect(self.video_screen.startScrubbing)
+        self.slider.sliderReleased.connect(self.video_screen.stopScrubbing)
+        self.slider.sliderReleased.connect(self.flushFrameRequest)
         right_label = QLabel(str(self.total_frames - 1))
         slider_layout.addWidget(left_label)
         slider_layout.addWidget(self.slider)
@@ -873,6 +1209,8 @@ class ThirdWindow(QWidget):
         # Label displayed above the slider
         self.slider_label = QLabel(self)
         self.slider_label.setAlignment(Qt.AlignCenter)
+        self.slider_label_width = None
+        self.cacheSliderGeometry()
 
         # Two centered buttons
         buttons_layout = QHBoxLayout()
@@ -912,6 +1250,8 @@ class ThirdWindow(QWidget):
         self.video_screen.toggleButtonClicked(button_number)
 
     def onBackClicked(self):
+        # The SecondWindow reads from the same capture once it is shown
+        self.stopPreview()
         self.show_second_window.emit()  # Emit the signal when back_button is clicked
         self.close()
 
@@ -923,8 +1263,13 @@ class ThirdWindow(QWidget):
             self.data["video_path"] = self.video_screen.video_path
             self.data["start_frame"] = self.video_screen.start_frame
             self.data["text_areas"] = self.video_screen.text_areas
-            self.data["cv2_cap_obj"] = self.cap
+            # Hardware decoders can shift pixel values around the text
+            # threshold, the text recognition decodes in software so its
+            # results don't depend on the machine
+            self.data["cv2_cap_obj"] = cv2.VideoCapture(self.video_path)
             self.data["save_hq_pics"] = self.save_hq_pics
+            self.stopPreview()
+            self.cap.release()
             self.data_signal.emit(self.data)
             self.close()
         else:
@@ -934,7 +1279,6 @@ class ThirdWindow(QWidget):
 
     def closeEvent(self, event):
         if event.spontaneous():  # If triggered by the user
-            self.video_screen.thread.stop()
             reply = QMessageBox.question(
                 self,
                 "Quit Application",
@@ -943,13 +1287,25 @@ class ThirdWindow(QWidget):
                 QMessageBox.No,
                 )
             if reply == QMessageBox.Yes:
+                self.stopPreview()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.stopPreview()
             self.data_signal.emit(self.data)
             super().closeEvent(event)
 
+    def cacheSliderGeometry(self):
+        # Only changes on resize, not on every value change
+        self.slider_geometry = (
+            self.slider.x(),
+            self.slider.y(),
+            self.slider.width(),
+            self.slider.minimum(),
+            self.slider.maximum(),
+        )
+
     def update_slider_label_postion(self):
         value = self.slider.value()
         value_str = str(value)
@@ -957,22 +1313,24 @@ class ThirdWindow(QWidget):
             30, 10 * len(value_str)
         )  # Example: base width of 30, plus 10 pixels per character
 
-        self.slider_label.setFixedWidth(label_width)
-        slider_width = self.slider.width()
-        min_value = self.slider.minimum()
-        max_value = self.slider.maximum()
+        if label_width != self.slider_label_width:
+            self.slider_label.setFixedWidth(label_width)
+            self.slider_label_width = label_width
+        slider_x, slider_y, slider_width, min_value, max_value = (
+            self.slider_geometry
+        )
         handle_x = (
             (value - min_value) / (max_value - min_value)
         ) * slider_width
         handle_width_estimate = 15
         label_x = (
-            self.slider.x()
+            slider_x
             + handle_x
             - (label_width // 2)
             + (handle_width_estimate // 2)
         )
         label_y = (
-            self.slider.y() - 25
+            slider_y - 25
         )  # Adjust Y as needed to be above the slider
 
         self.slider_label.move(label_x, label_y)
@@ -980,6 +1338,7 @@ class ThirdWindow(QWidget):
 
     # Step 2: Override the resizeEvent method
     def resizeEvent(self, event):
+        self.cacheSliderGeometry()
         self.update_slider_label_postion()
         event.accept()  # Call the base class method to ensure the event is properly handled
 
@@ -987,16 +1346,30 @@ class ThirdWindow(QWidget):
         self.update_slider_label_postion()
         # if self.thread.isRunning:
         #     self.thread.stop()
-        self.video_screen.thread.setFrameNumber(
-            value
+        self.frame_request_timer.start()  # Restarts if already running
+
+    def requestFrame(self):
+        # Frames shown during a drag don't have to be exact
+        self.video_screen.changeFrame(
+            self.slider.value(), exact=not self.slider.isSliderDown()
         )  # Pass the slider value to the thread
-        self.video_screen.thread.start()
+
+    def flushFrameRequest(self):
+        # Show the final position right away when the drag ends
+        self.frame_request_timer.stop()
+        self.requestFrame()
+
+    def stopPreview(self):
+        # A pending request would restart reading from the capture
+        self.frame_request_timer.stop()
+        self.video_screen.stopPreview()
 
 signal.signal(signal.SIGINT, signal.SIG_DFL)
 
 
-def apply_dark_theme(app):
-    app.setStyle("Fusion")
+@functools.cache
+def create_dark_palette():
+    # Built once, reused on every theme toggle
     dark_palette = QPalette()
     dark_palette.setColor(QPalette.Window, QColor(53, 53, 53))
     dark_palette.setColor(QPalette.WindowText, Qt.white)
@@ -1011,11 +1384,12 @@ def apply_dark_theme(app):
     dark_palette.setColor(QPalette.Link, QColor(42, 130, 218))
     dark_palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
     dark_palette.setColor(QPalette.HighlightedText, Qt.black)
-    app.setPalette(dark_palette)
-    app.setStyleSheet("QCheckBox { color: white; }")
+    return dark_palette
 
 
-def apply_light_theme(app):
+@functools.cache
+def create_light_palette():
+    # Built once, reused on every theme toggle
     light_palette = QPalette()
     light_palette.setColor(QPalette.Window, QColor(255, 255, 255))
     light_palette.setColor(QPalette.WindowText, Qt.black)
@@ -1030,7 +1404,17 @@ def apply_light_theme(app):
     light_palette.setColor(QPalette.Link, QColor(0, 122, 204))
     light_palette.setColor(QPalette.Highlight, QColor(0, 122, 204))
     light_palette.setColor(QPalette.HighlightedText, Qt.white)
-    app.setPalette(light_palette)
+    return light_palette
+
+
+def apply_dark_theme(app):
+    app.setStyle("Fusion")
+    app.setPalette(create_dark_palette())
+    app.setStyleSheet("QCheckBox { color: white; }")
+
+
+def apply_light_theme(app):
+    app.setPalette(create_light_palette())
     app.setStyleSheet("QCheckBox { color: black; }")
 
 
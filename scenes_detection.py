@@ -2,33 +2,39 @@
 
 from typing import List, Tuple
 from scenedetect import open_video, SceneManager, AdaptiveDetector
+from scenedetect.backends import AVAILABLE_BACKENDS
 from scenedetect.frame_timecode import FrameTimecode
 from files_operations import find_video_file
 
 
 def detect_all_scenes(
     video_name: str = None,
+    show_progress: bool = True,
 ) -> List[Tuple[FrameTimecode, FrameTimecode]]:
     """Detect all scenes in a video.
 
     Args:
         video_name (str, optional): Video name. Defaults to None.
+        show_progress (bool, optional): If True, shows a progress bar.
+            Defaults to True.
 
     Returns:
         List[Tuple[FrameTimecode, FrameTimecode]]: List of scenes.
     """
     #TODO Check if you can set start time
     if video_name is not None:
-        video = open_video(video_name)
+        # PyAV decodes faster, it's used only if installed
+        backend = "pyav" if "pyav" in AVAILABLE_BACKENDS else "opencv"
+        video = open_video(video_name, backend=backend)
         scene_manager = SceneManager()
         scene_manager.add_detector(AdaptiveDetector())
-        print("\n-Detecting scenes-")
-        scene_manager.detect_scenes(video=video, show_progress=True)
+        scene_manager.detect_scenes(video=video, show_progress=show_progress)
         scene_list = scene_manager.get_scene_list(start_in_scene=True)
         return scene_list
 
 
 if __name__ == "__main__":
     video_name = find_video_file()
+    print("\n-Detecting scenes-")
     scene_list = detect_all_scenes(video_name)
     print(scene_list)
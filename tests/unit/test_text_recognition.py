@@ -1,5 +1,8 @@
+import os
 import pytest
 import cv2
+import numpy as np
+import pytesseract
 from text_recognition import TextRecognition
 
 
@@ -49,6 +52,45 @@ class TestTextRecognition:
                 self.text_rec.convert_current_frame_to_tc(element) == expected
             )
 
+    ##########################################################################
+    # convert_frames_to_tc()
+
+    frame_numbers = [
+        0,
+        1,
+        23,
+        24,
+        25,
+        29,
+        30,
+        1439,
+        1440,
+        1799,
+        1800,
+        86399,
+        86400,
+        107892,
+        2589410,
+        10368000,
+    ]
+
+    @pytest.mark.parametrize("video_fps", [24, 25, 29.97, 23.976])
+    def test_convert_frames_to_tc(self, monkeypatch, video_fps):
+        monkeypatch.setattr(self.text_rec, "video_fps", video_fps)
+        assert self.text_rec.convert_frames_to_tc(
+            np.array(self.frame_numbers, dtype=np.int64)
+        ) == [
+            self.text_rec.convert_current_frame_to_tc(str(frame_number))
+            for frame_number in self.frame_numbers
+        ]
+
+    def test_convert_frames_to_tc_empty(self, monkeypatch):
+        monkeypatch.setattr(self.text_rec, "video_fps", 25)
+        assert (
+            self.text_rec.convert_frames_to_tc(np.array([], dtype=np.int64))
+            == []
+        )
+
     ##########################################################################
     # read_tc_add_one_frame()
 
@@ -149,6 +191,74 @@ class TestTextRecognition:
             }
         }
 
+    @pytest.mark.parametrize(
+        "text_dict,expected",
+        [
+            ({}, {}),
+            (
+                {40: {"TEXT": "ADR: Hi", "TC": "00:00:01:15"}},
+                {
+                    40: {
+                        "TEXT": "ADR: Hi",
+                        "TC IN": "00:00:01:15",
+                        "TC OUT": "00:00:01:16",
+                        "FRAME OUT": 41,
+                    }
+                },
+            ),
+            (
+                {
+                    40: {"TEXT": "ADR: Hi", "TC": "00:00:01:15"},
+                    42: {"TEXT": "ADR: Bye", "TC": "00:00:01:17"},
+                },
+                {
+                    40: {
+                        "TEXT": "ADR: Hi",
+                        "TC IN": "00:00:01:15",
+                        "TC OUT": "00:00:01:16",
+                        "FRAME OUT": 41,
+                    },
+                    42: {
+                        "TEXT": "ADR: Bye",
+                        "TC IN": "00:00:01:17",
+                        "TC OUT": "00:00:01:18",
+                        "FRAME OUT": 43,
+                    },
+                },
+            ),
+            (
+                {
+                    48: {"TEXT": "ADR: Hi", "TC": "00:00:01:23"},
+                    49: {"TEXT": "ADR: Hl", "TC": "00:00:01:24"},
+                    50: {"TEXT": "ADR: Hi", "TC": "00:00:02:00"},
+                    75: {"TEXT": "ADR: Bye", "TC": "WRONG TC"},
+                },
+                {
+                    48: {
+                        "TEXT": "ADR: Hi",
+                        "TC IN": "00:00:01:23",
+                        "TC OUT": "00:00:02:01",
+                        "FRAME OUT": 51,
+                    },
+                    75: {
+                        "TEXT": "ADR: Bye",
+                        "TC IN": "WRONG TC",
+                        "TC OUT": "WRONG TC",
+                        "FRAME OUT": 76,
+                    },
+                },
+            ),
+        ],
+    )
+    def test_remove_all_but_border_cases_found_runs(
+        self, monkeypatch, text_dict, expected
+    ):
+        monkeypatch.setattr(self.text_rec, "video_fps", 25)
+        assert (
+            self.text_rec.remove_all_but_border_cases_found(text_dict)
+            == expected
+        )
+
     ##########################################################################
     # construct_most_common_word()
 
@@ -238,6 +348,55 @@ class TestTextRecognition:
             == self.merged_dict
         )
 
+    vfx_entry = {
+        "text": "VFX: CLEANUP",
+        "TC IN": "00:01:00:00",
+        "TC OUT": "00:01:02:00",
+    }
+    adr_entry = {
+        "text": "ADR: Hmm",
+        "TC IN": "00:01:00:00",
+        "TC OUT": "00:01:01:00",
+    }
+
+    @pytest.mark.parametrize(
+        "dict_a,dict_b,expected",
+        [
+            ({}, {}, {}),
+            (dict_a, {}, dict_a),
+            ({}, dict_b, dict_b),
+            (
+                {1500: vfx_entry},
+                {1500: adr_entry},
+                {
+                    1500: {
+                        "text": ["VFX: CLEANUP", "ADR: Hmm"],
+                        "TC IN": "00:01:00:00",
+                        "TC OUT": ["00:01:02:00", "00:01:01:00"],
+                    }
+                },
+            ),
+            (
+                {1500: vfx_entry, 10: adr_entry},
+                {2000: vfx_entry, 1500: adr_entry},
+                {
+                    10: adr_entry,
+                    1500: {
+                        "text": ["VFX: CLEANUP", "ADR: Hmm"],
+                        "TC IN": "00:01:00:00",
+                        "TC OUT": ["00:01:02:00", "00:01:01:00"],
+                    },
+                    2000: vfx_entry,
+                },
+            ),
+        ],
+    )
+    def test_merge_dicts_cases(self, dict_a, dict_b, expected):
+        merged = self.text_rec.merge_dicts(dict_a, dict_b)
+        assert merged == expected
+        # Keys come out sorted whatever order the inputs had
+        assert list(merged) == sorted(merged)
+
     ##########################################################################
     # add_real_timestamps()
 
@@ -370,15 +529,172 @@ class TestTextRecognition:
     ##########################################################################
     # frame_processing()
 
+    ##########################################################################
+    # process_area()
+
+    frame = np.zeros((10, 20, 3), dtype=np.uint8)
+    frame[2:5, 4:8] = 255
+
+    whole_frame_area = np.full((10, 20), 255, dtype=np.uint8)
+    whole_frame_area[2:5, 4:8] = 0
+
+    @pytest.mark.parametrize(
+        "area,expected",
+        [
+            (
+                [(0, 0), (20, 0), (20, 10), (0, 10)],
+                whole_frame_area,
+            ),
+            (
+                [(4, 2), (8, 2), (8, 5), (4, 5)],
+                np.zeros((3, 4), dtype=np.uint8),
+            ),
+            (
+                [(4, 2), (4, 2), (4, 5), (4, 5)],
+                np.zeros((3, 0), dtype=np.uint8),
+            ),
+        ],
+    )
+    def test_process_area(self, area, expected):
+        result = self.text_rec.process_area(self.frame, area)
+        assert result.dtype == np.uint8
+        assert np.array_equal(result, expected)
+
     ##########################################################################
     # check_if_scenes_can_contian_text()
 
+    scene_list = [(0, 100), (100, 200), (200, 300)]
+
+    @pytest.mark.parametrize(
+        "start_frame,scene_list,frames_with_text,expected",
+        [
+            (0, scene_list, [20], [[0, 100]]),
+            (0, scene_list, [150], []),
+            (0, scene_list, [140, 260], [[100, 200], [200, 300]]),
+            (0, scene_list, [], []),
+            (0, [], [20], []),
+            (150, scene_list, [150], [[150, 200]]),
+            (150, scene_list, [20], []),
+        ],
+    )
+    def test_check_if_scenes_can_contain_text(
+        self, monkeypatch, start_frame, scene_list, frames_with_text, expected
+    ):
+        monkeypatch.setattr(self.text_rec, "start_frame", start_frame)
+        assert (
+            self.text_rec.check_if_scenes_can_contain_text(
+                scene_list, frames_with_text
+            )
+            == expected
+        )
+
     ##########################################################################
     # generate_pictures_for_each_scene()
 
     ##########################################################################
     # read_text_from_image()
 
+    ##########################################################################
+    # read_text_from_images()
+
+    ocr_pages = ["VFX: ONE\n\nVFX: TWO\n", "", "VFX: THREE\n"]
+
+    @pytest.fixture
+    def fixture_tesseract_calls(self, monkeypatch, tmp_path):
+        # Tesseract ends every page with a form feed, the fake does the same
+        # for single images and for list files
+        monkeypatch.setattr(self.text_rec, "files_path", str(tmp_path))
+        (tmp_path / "temp").mkdir()
+        pages = {}
+        for frame_number, page in enumerate(self.ocr_pages):
+            image_path = tmp_path / "temp" / f"frame_{frame_number}.png"
+            image_path.touch()
+            pages[str(image_path)] = page
+        calls = []
+
+        def image_to_string(image, lang, config):
+            calls.append(image)
+            if image.endswith(".txt"):
+                with open(image) as list_file:
+                    image_paths = list_file.read().splitlines()
+                return "".join(pages[path] + "\f" for path in image_paths)
+            return pages[image] + "\f"
+
+        monkeypatch.setattr(pytesseract, "image_to_string", image_to_string)
+        return list(pages), calls
+
+    def test_read_text_from_images_splits_pages(self, fixture_tesseract_calls):
+        image_paths, calls = fixture_tesseract_calls
+        assert self.text_rec.read_text_from_images(image_paths, "text") == [
+            [["VFX: ONE", "VFX: TWO"]],
+            [[]],
+            [["VFX: THREE"]],
+        ]
+        assert len(calls) == 1 and calls[0].endswith(".txt")
+        # The list file is removed after the run
+        assert sorted(os.listdir(os.path.dirname(calls[0]))) == sorted(
+            os.path.basename(path) for path in image_paths
+        )
+
+    @pytest.mark.parametrize("image_count", [0, 1, 2, 3])
+    def test_read_text_from_images_same_as_one_by_one(
+        self, fixture_tesseract_calls, image_count
+    ):
+        image_paths, _ = fixture_tesseract_calls
+        image_paths = image_paths[:image_count]
+        expected = [
+            self.text_rec.read_text_from_image(path, "text")
+            for path in image_paths
+        ]
+        assert (
+            self.text_rec.read_text_from_images(image_paths, "text")
+            == expected
+        )
+
+    def test_read_text_from_images_falls_back_when_pages_missing(
+        self, monkeypatch, fixture_tesseract_calls
+    ):
+        image_paths, calls = fixture_tesseract_calls
+        fake_image_to_string = pytesseract.image_to_string
+
+        def image_to_string(image, lang, config):
+            if image.endswith(".txt"):
+                calls.append(image)
+                # Pages without text separators can't be assigned to images
+                return "VFX: ONE\nVFX: TWO\nVFX: THREE\n"
+            return fake_image_to_string(image, lang, config)
+
+        monkeypatch.setattr(pytesseract, "image_to_string", image_to_string)
+        assert self.text_rec.read_text_from_images(image_paths, "text") == [
+            [["VFX: ONE", "VFX: TWO"]],
+            [[]],
+            [["VFX: THREE"]],
+        ]
+        assert calls[1:] == image_paths
+
+    def test_read_text_from_images_falls_back_when_tesseract_fails(
+        self, monkeypatch, fixture_tesseract_calls
+    ):
+        image_paths, calls = fixture_tesseract_calls
+        fake_image_to_string = pytesseract.image_to_string
+
+        def image_to_string(image, lang, config):
+            if image.endswith(".txt"):
+                calls.append(image)
+                # One unreadable image fails the whole list file
+                raise pytesseract.TesseractError(1, "Error in pixReadStream")
+            return fake_image_to_string(image, lang, config)
+
+        monkeypatch.setattr(pytesseract, "image_to_string", image_to_string)
+        assert self.text_rec.read_text_from_images(image_paths, "text") == [
+            [["VFX: ONE", "VFX: TWO"]],
+            [[]],
+            [["VFX: THREE"]],
+        ]
+        assert calls[1:] == image_paths
+        # The list file is removed after the failed run as well
+        assert not os.path.exists(calls[0])
+
     ##########################################################################
     # generate_processed_pictures()
 
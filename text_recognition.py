@@ -3,11 +3,15 @@ It generates pictures with text from a video, detects VFX and ADR text,
 and generates a dictionary with the results."""
 
 from typing import List, Tuple, Dict
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+import functools
 import logging
+import os
 import re
+import tempfile
 import cv2
-from PIL import Image
 import pytesseract
 import numpy as np
 from tqdm import tqdm
@@ -16,6 +20,19 @@ from files_operations import delete_temp_folder_on_error_and_exit
 from scenedetect.frame_timecode import FrameTimecode
 
 
+@functools.lru_cache(maxsize=8)
+def compile_text_pattern(beginning_chars: str) -> re.Pattern:
+    """Compiles the pattern used by match_text, once per beginning characters.
+
+    Args:
+        beginning_chars (str): Characters from which the text starts.
+
+    Returns:
+        re.Pattern: Case insensitive pattern matching the text.
+    """
+    return re.compile(beginning_chars + r"\s*(.+)", re.IGNORECASE)
+
+
 class TextRecognition:
     """Class for text recognition in a video.
     It generates pictures with text from a video,
@@ -30,6 +47,26 @@ class TextRecognition:
         tc_area (List[Tuple[int, int]]): Time code area.
     """
 
+    # Decoding through a shorter gap is cheaper than seeking
+    # (about 4 seconds of footage)
+    max_frames_to_grab = 100
+    # Two digit groups of a time code read by OCR
+    tc_pattern = re.compile(r"(\d{2})")
+    # The crops are read back by OCR right away, zlib effort isn't worth it
+    temp_png_params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    # Tesseract command line options for each read mode
+    tesseract_options = {
+        "text": (
+            "--psm 6 -c load_system_dawg=false load_freq_dawg=false"
+            " tessedit_char_whitelist= 0123456789"
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz?!:"
+        ),
+        "tc": (
+            "--psm 7 -c tessedit_char_whitelist=:0123456789"
+            " load_system_dawg=false -c load_freq_dawg=false"
+        ),
+    }
+
     def __init__(
         self,
         cap: cv2.VideoCapture,
@@ -115,10 +152,9 @@ class TextRecognition:
         """
         if not tc_text or not tc_text[0]:
             return "EMPTY TC"
-        pattern = re.compile(r"(\d{2})")
         joined_text = "".join(tc_text[0])
         try:
-            x = re.findall(pattern, joined_text)
+            x = self.tc_pattern.findall(joined_text)
             formated_text = f"{x[0]}:{x[1]}:{x[2]}:{x[3]}"
         except IndexError as e:
             logging.exception(
@@ -139,8 +175,11 @@ class TextRecognition:
         Returns:
             str: Matched text. If no match, returns an empty string.
         """
-        pattern = re.compile(beginning_chars + r"\s*(.+)", re.IGNORECASE)
-        match = re.search(pattern, text)
+        # OCR output is ASCII only (see the whitelist), so most lines can
+        # be rejected without running the regex
+        if beginning_chars.lower() not in text.lower():
+            return ""
+        match = compile_text_pattern(beginning_chars).search(text)
         if match is None:
             return ""
         else:
@@ -201,41 +240,66 @@ class TextRecognition:
             ascii=" █",
         )
         frames_counter = 0
-        while self.cap.isOpened():
-            ret, frame = self.cap.read()
-            if ret is True:
-                current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES) - 1)
-                binary_image = self.frame_processing(frame)
-                top_left, _, bottom_right, _ = self.text_area
-                cropped_img_l = binary_image[
-                    top_left[1] : bottom_right[1],
-                    top_left[0] : bottom_right[0],
-                ]
-                n_black_pix = np.sum(cropped_img_l == 0)
-                pbar.set_postfix_str(
-                    f"Frames saved: {frames_counter}", refresh=True
-                )
-                if n_black_pix >= 2000:
-                    top_left, _, bottom_right, _ = self.tc_area
-                    cropped_img_r = binary_image[
-                        top_left[1] : bottom_right[1],
-                        top_left[0] : bottom_right[0],
-                    ]
-                    filename = f"frame_{current_frame}.png"
-                    cv2.imwrite(
-                        f"{self.files_path}/temp/text_imgs/" + filename,
-                        cropped_img_l,
+        # Decoded frames are written into the same buffer on every read
+        frame = None
+        # Asked once, the reads are sequential from here on
+        current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+        max_workers = os.cpu_count() or 1
+        pending_writes = deque()
+        # Looked up once instead of on every frame
+        read_frame = self.cap.read
+        process_area = self.process_area
+        text_area = self.text_area
+        tc_area = self.tc_area
+        text_imgs_dir = f"{self.files_path}/temp/text_imgs/"
+        tc_imgs_dir = f"{self.files_path}/temp/tc_imgs/"
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while self.cap.isOpened():
+                ret, frame = read_frame(frame)
+                if ret is True:
+                    current_frame += 1
+                    # Only the areas are processed, not the whole frame
+                    cropped_img_l = process_area(frame, text_area)
+                    # Counted by OpenCV without a temporary boolean mask
+                    n_black_pix = cropped_img_l.size - cv2.countNonZero(
+                        cropped_img_l
                     )
-                    cv2.imwrite(
-                        f"{self.files_path}/temp/tc_imgs/" + filename,
-                        cropped_img_r,
+                    pbar.set_postfix_str(
+                        f"Frames saved: {frames_counter}", refresh=True
                     )
-                    # frames_with_embedded_text_id.append(int(filename.split(".")[0][6:]))
-                    frames_with_embedded_text_id.append(int(current_frame))
-                    frames_counter += 1
-                pbar.update(1)
-            else:
-                break
+                    if n_black_pix >= 2000:
+                        cropped_img_r = process_area(frame, tc_area)
+                        filename = f"frame_{current_frame}.png"
+                        # The crops are new arrays, not views into the
+                        # reused decode buffer, so they can be encoded
+                        # while the next frames are read
+                        pending_writes.append(
+                            executor.submit(
+                                cv2.imwrite,
+                                text_imgs_dir + filename,
+                                cropped_img_l,
+                                self.temp_png_params,
+                            )
+                        )
+                        pending_writes.append(
+                            executor.submit(
+                                cv2.imwrite,
+                                tc_imgs_dir + filename,
+                                cropped_img_r,
+                                self.temp_png_params,
+                            )
+                        )
+                        # frames_with_embedded_text_id.append(int(filename.split(".")[0][6:]))
+                        frames_with_embedded_text_id.append(current_frame)
+                        frames_counter += 1
+                    pbar.update(1)
+                    while len(pending_writes) > 2 * max_workers:
+                        pending_writes.popleft().result()
+                else:
+                    break
+            # Raises the errors of the writes that weren't checked yet
+            while pending_writes:
+                pending_writes.popleft().result()
         pbar.close()
 
         return frames_with_embedded_text_id
@@ -255,6 +319,28 @@ class TextRecognition:
         )
         return threshold
 
+    def process_area(
+        self, frame: np.ndarray, area: List[Tuple[int, int]]
+    ) -> np.ndarray:
+        """Crops an area from a frame and applies processing only to it.
+
+        Args:
+            frame (np.ndarray): Frame to crop the area from.
+            area (List[Tuple[int, int]]): Corners of the area.
+
+        Returns:
+            np.ndarray: Binary image of the area.
+        """
+        top_left, _, bottom_right, _ = area
+        cropped_frame = frame[
+            top_left[1] : bottom_right[1],
+            top_left[0] : bottom_right[0],
+        ]
+        if cropped_frame.size == 0:
+            # OpenCV doesn't accept empty images
+            return np.zeros(cropped_frame.shape[:2], dtype=np.uint8)
+        return self.frame_processing(cropped_frame)
+
     def check_if_scenes_can_contain_text(
         self,
         scene_list: List[Tuple[FrameTimecode, FrameTimecode]],
@@ -281,21 +367,27 @@ class TextRecognition:
         each_scene_first_last_frame = self.update_start_frame(
             each_scene_first_last_frame
         )
-        numbers_to_check = [
-            self.evenly_spaced_nums_from_range(range, q_nums=5, endpoint=False)
-            for range in each_scene_first_last_frame
-        ]
-        potential_frames_ranges_with_vfx_text = []
-        for sublist in numbers_to_check:
-            if any(frame in frames_with_embedded_text_id for frame in sublist):
-                potential_frames_ranges_with_vfx_text.append([
-                    each_scene_first_last_frame[
-                        numbers_to_check.index(sublist)
-                    ][0],
-                    each_scene_first_last_frame[
-                        numbers_to_check.index(sublist)
-                    ][1],
-                ])
+        scenes_borders = np.array(
+            each_scene_first_last_frame, dtype=np.int64
+        ).reshape(-1, 2)
+        # One row of frames to check per scene
+        numbers_to_check = np.linspace(
+            scenes_borders[:, 0],
+            scenes_borders[:, 1],
+            num=5,
+            endpoint=False,
+            dtype=np.int64,
+            axis=1,
+        )
+        frames_with_text = np.asarray(
+            frames_with_embedded_text_id, dtype=np.int64
+        )
+        scenes_with_text = np.isin(numbers_to_check, frames_with_text).any(
+            axis=1
+        )
+        potential_frames_ranges_with_vfx_text = scenes_borders[
+            scenes_with_text
+        ].tolist()
         print(
             "-Found potential text in"
             f" {len(potential_frames_ranges_with_vfx_text)} scenes-"
@@ -312,17 +404,18 @@ class TextRecognition:
         Returns:
         list of [int, int]: Updated list of ranges.
         """
+        updated_ranges = np.array(ranges, dtype=np.int64).reshape(-1, 2)
         # Filter out ranges where the end number is smaller than the new number
-        updated_ranges = [
-            range for range in ranges if range[1] >= self.start_frame
+        updated_ranges = updated_ranges[
+            updated_ranges[:, 1] >= self.start_frame
         ]
 
         # Update the start frame of the range that contain the start frame
-        # of the program
-        for i, (start, end) in enumerate(updated_ranges):
-            if start <= self.start_frame <= end:
-                updated_ranges[i][0] = self.start_frame
-        return updated_ranges
+        # of the program (every range left ends at or after it)
+        updated_ranges[updated_ranges[:, 0] <= self.start_frame, 0] = (
+            self.start_frame
+        )
+        return updated_ranges.tolist()
 
     def generate_pictures_for_each_scene(
         self, potential_frames_ranges_with_vfx_text: List[List[int]]
@@ -331,9 +424,15 @@ class TextRecognition:
 
         It generates thumbnails and first and last frames of the scene.
         The pictures are saved in the temp folder.
-        The thumbnails are saved in the thumbnails folder,
+        The thumbnails are saved as JPEG in the thumbnails folder,
         and the first and last frames are saved in the
         first_last_scene_frames folder.
+        The frames are requested in ascending order. The capture only
+        seeks for gaps longer than max_frames_to_grab, shorter gaps are
+        decoded through with grab(), so nearby scenes don't trigger a
+        seek and a re-decode from the previous keyframe.
+        Frames are decoded one by one, the PNG encoding runs in a thread
+        pool (cv2.imwrite releases the GIL).
 
         Args:
             potential_frames_ranges_with_vfx_text (List[List[int]]):
@@ -341,36 +440,69 @@ class TextRecognition:
         """
 
         print("\n-Generating Pictures-")
-        for frame_range in tqdm(
-            potential_frames_ranges_with_vfx_text,
-            desc="Generated ",
-            unit="imgs",
-            ascii=" █",
-        ):
-            begining_frame = frame_range[0]
-            last_frame = frame_range[1] - 1
-            which_frame_from_loop = 0
-            for frame_number in [begining_frame, last_frame]:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-                found_frame, frame = self.cap.read()
-                if found_frame:
-                    if which_frame_from_loop == 0:
-                        img = cv2.resize(frame, None, fx=0.25, fy=0.25)
-                        cv2.imwrite(
-                            f"{self.files_path}/temp/thumbnails/{frame_number}.png",
-                            img,
-                        )
-                        cv2.imwrite(
-                            f"{self.files_path}/temp/first_last_scene_frames/{frame_number}.png",
-                            frame,
-                        )
-                        which_frame_from_loop += 1
-                    elif which_frame_from_loop == 1:
-                        cv2.imwrite(
-                            f"{self.files_path}/temp/first_last_scene_frames/{frame_number}.png",
-                            frame,
-                        )
-                        which_frame_from_loop -= 1
+        next_frame_in_cap = None
+        max_workers = os.cpu_count() or 1
+        pending_writes = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for frame_range in tqdm(
+                potential_frames_ranges_with_vfx_text,
+                desc="Generated ",
+                unit="imgs",
+                ascii=" █",
+            ):
+                begining_frame = frame_range[0]
+                last_frame = frame_range[1] - 1
+                which_frame_from_loop = 0
+                for frame_number in [begining_frame, last_frame]:
+                    frames_to_skip = (
+                        frame_number - next_frame_in_cap
+                        if next_frame_in_cap is not None
+                        else -1
+                    )
+                    if 0 <= frames_to_skip <= self.max_frames_to_grab:
+                        for _ in range(frames_to_skip):
+                            self.cap.grab()
+                    else:
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                    found_frame, frame = self.cap.read()
+                    next_frame_in_cap = (
+                        frame_number + 1 if found_frame else None
+                    )
+                    if found_frame:
+                        if which_frame_from_loop == 0:
+                            img = cv2.resize(frame, None, fx=0.25, fy=0.25)
+                            pending_writes.append(
+                                executor.submit(
+                                    cv2.imwrite,
+                                    f"{self.files_path}/temp/thumbnails/{frame_number}.jpg",
+                                    img,
+                                    [cv2.IMWRITE_JPEG_QUALITY, 85],
+                                )
+                            )
+                            pending_writes.append(
+                                executor.submit(
+                                    cv2.imwrite,
+                                    f"{self.files_path}/temp/first_last_scene_frames/{frame_number}.png",
+                                    frame,
+                                )
+                            )
+                            which_frame_from_loop += 1
+                        elif which_frame_from_loop == 1:
+                            pending_writes.append(
+                                executor.submit(
+                                    cv2.imwrite,
+                                    f"{self.files_path}/temp/first_last_scene_frames/{frame_number}.png",
+                                    frame,
+                                )
+                            )
+                            which_frame_from_loop -= 1
+                # Don't keep more decoded frames in memory than the
+                # pool can encode
+                while len(pending_writes) > 2 * max_workers:
+                    pending_writes.popleft().result()
+            # Raises the errors of the writes that weren't checked yet
+            while pending_writes:
+                pending_writes.popleft().result()
 
     def read_text_from_image(self, image_path: str, mode: str) -> List[str]:
         """Reads text from an image.
@@ -382,35 +514,81 @@ class TextRecognition:
         Returns:
             List[str]: List of found text in the image.
         """
-        allowlist = (
-            " 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz?!:"
-        )
-        options_for_text = (
-            "--psm 6 -c load_system_dawg=false load_freq_dawg=false"
-            f" tessedit_char_whitelist={allowlist}"
-        )
-        options_for_tc = (
-            "--psm 7 -c tessedit_char_whitelist=:0123456789"
-            " load_system_dawg=false -c load_freq_dawg=false"
-        )
-        if mode == "text":
-            options = options_for_text
-        elif mode == "tc":
-            options = options_for_tc
+        # Tesseract reads the file itself, pytesseract only re-encodes
+        # images it gets as PIL objects. Callers expect the same error
+        # as from opening a missing file.
+        if not os.path.isfile(image_path):
+            raise FileNotFoundError(f"No such file: '{image_path}'")
         found_text = [
             list(
                 filter(
                     None,
                     pytesseract.image_to_string(
-                        Image.open(image_path),
+                        image_path,
                         lang="eng",
-                        config=options,
+                        config=self.tesseract_config(mode),
                     ).splitlines(),
                 )
             )
         ]
         return found_text
 
+    def read_text_from_images(
+        self, image_paths: List[str], mode: str
+    ) -> List[List[List[str]]]:
+        """Reads text from multiple images with a single Tesseract run.
+
+        The paths are passed to Tesseract in a list file, so the engine
+        is started and the language model is loaded once for all of them.
+        If Tesseract fails on the batch, e.g. because of one corrupt
+        image, or the output can't be split into pages, one per image,
+        the images are read one by one instead.
+
+        Args:
+            image_paths (List[str]): Image paths.
+            mode (str): Mode to read. Can be "text" or "tc".
+
+        Returns:
+            List[List[List[str]]]: Found text for each image, in the same
+                format as returned by read_text_from_image.
+        """
+        if len(image_paths) < 2:
+            return [self.read_text_from_image(p, mode) for p in image_paths]
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".txt", dir=f"{self.files_path}/temp", delete=False
+        ) as list_file:
+            list_file.write("\n".join(image_paths))
+        try:
+            output = pytesseract.image_to_string(
+                list_file.name,
+                lang="eng",
+                config=self.tesseract_config(mode),
+            )
+        except pytesseract.TesseractError as e:
+            logging.exception("Batched OCR failed, reading one by one.\n%s", e)
+            return [self.read_text_from_image(p, mode) for p in image_paths]
+        finally:
+            os.remove(list_file.name)
+        # Tesseract separates the pages with a form feed
+        pages = output.split("\f")
+        if len(pages) < len(image_paths):
+            return [self.read_text_from_image(p, mode) for p in image_paths]
+        return [
+            [list(filter(None, page.splitlines()))]
+            for page in pages[: len(image_paths)]
+        ]
+
+    def tesseract_config(self, mode: str) -> str:
+        """Returns the Tesseract options for the given mode.
+
+        Args:
+            mode (str): Mode to read. Can be "text" or "tc".
+
+        Returns:
+            str: Tesseract command line options.
+        """
+        return self.tesseract_options[mode]
+
     def generate_processed_pictures(
         self, image_path: str, frame_number: int
     ) -> None:
@@ -421,15 +599,11 @@ class TextRecognition:
             frame_number (int): Frame number.
         """
         frame = cv2.imread(image_path)
-        binary_image = self.frame_processing(frame)
-        top_left, _, bottom_right, _ = self.tc_area
-        cropped_img_r = binary_image[
-            top_left[1] : bottom_right[1],
-            top_left[0] : bottom_right[0],
-        ]
+        cropped_img_r = self.process_area(frame, self.tc_area)
         cv2.imwrite(
             f"{self.files_path}/temp/first_last_scene_frames/frame_{frame_number}.png",
             cropped_img_r,
+            self.temp_png_params,
         )
 
     def generate_vfx_text(
@@ -457,17 +631,25 @@ class TextRecognition:
         frames_not_found: list = []
         found_vfx_flag: bool = False
         print("\n-Reading VFX text-")
-        for frame_range in tqdm(
-            potential_frames_ranges_with_vfx_text,
-            desc="Frames checked",
-            unit="frames",
-            ascii=" █",
+        # Chooses a couple of frames from each range to check for VFX text
+        images_per_range = []
+        # One linspace call for all ranges, one row per range
+        scenes_borders = np.array(
+            potential_frames_ranges_with_vfx_text, dtype=np.int64
+        ).reshape(-1, 2)
+        numbers_to_check_per_range = np.linspace(
+            scenes_borders[:, 0],
+            scenes_borders[:, 1],
+            num=8,
+            endpoint=False,
+            dtype=np.int64,
+            axis=1,
+        ).tolist()
+        for frame_range, numbers_to_check in zip(
+            potential_frames_ranges_with_vfx_text, numbers_to_check_per_range
         ):
-            # Chooses a couple of frames from the range to check for VFX text
-            numbers_to_check = self.evenly_spaced_nums_from_range(
-                frame_range, q_nums=8, endpoint=False
-            )
-            text_found_in_a_range = []
+            # All checked frames of a range are read in one Tesseract run
+            images = []
             for frame_id in numbers_to_check:
                 # if frame_id in frames_with_embedded_text_id:
                 #     if found_vfx_flag is True:
@@ -477,9 +659,31 @@ class TextRecognition:
                     continue
                 if frame_id > frame_range[1] - 1:
                     break
-                try:
-                    image = f"{self.files_path}/temp/text_imgs/frame_{frame_id}.png"
-                    text = self.read_text_from_image(image, mode="text")
+                image = f"{self.files_path}/temp/text_imgs/frame_{frame_id}.png"
+                if os.path.exists(image):
+                    images.append(image)
+                else:
+                    frames_not_found.append(frame_id)
+                    logging.error(
+                        f"Error with frame {frame_id}:\n No such file: '{image}'"
+                    )
+            images_per_range.append(images)
+        # Tesseract runs in its own processes, so threads are enough to read
+        # the ranges in parallel. Results are still handled in order.
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            texts_per_range = executor.map(
+                functools.partial(self.read_text_from_images, mode="text"),
+                images_per_range,
+            )
+            for frame_range, texts in tqdm(
+                zip(potential_frames_ranges_with_vfx_text, texts_per_range),
+                total=len(potential_frames_ranges_with_vfx_text),
+                desc="Frames checked",
+                unit="frames",
+                ascii=" █",
+            ):
+                text_found_in_a_range = []
+                for text in texts:
                     if not text:
                         continue
                     text_in_current_frame = []
@@ -493,85 +697,76 @@ class TextRecognition:
                     if text_in_current_frame:
                         vfx_text = " \n".join(text_in_current_frame)
                         text_found_in_a_range.append(vfx_text)
-                except FileNotFoundError as e:
-                    frames_not_found.append(frame_id)
-                    logging.exception(f"Error with frame {frame_id}:\n %s", e)
-                    continue
-            if text_found_in_a_range:
-                most_probable_text = self.construct_most_common_word(
-                    text_found_in_a_range
-                )
-                # found_vfx_flag = True
-                first_frame_of_scene = frame_range[0]
-                last_frame_of_scene = frame_range[1] - 1
-
-                # TODO: Program should check if both frames
-                # don't exist already.
-                right_first_image = f"{self.files_path}/temp/first_last_scene_frames/{first_frame_of_scene}.png"
-                right_last_image = f"{self.files_path}/temp/first_last_scene_frames/{last_frame_of_scene}.png"
-                try:
-                    # Generates processed pictures in case the
-                    # person that crated the video by chance
-                    # added the text later in the scene or
-                    # removed it before the scene ends.
-                    # That way, knowing that there is the text
-                    # in the scene, we can check and read TC
-                    # from the correct images.
-                    self.generate_processed_pictures(
-                        right_first_image, first_frame_of_scene
-                    )
-                    first_frame_tc = self.read_text_from_image(
-                        f"{self.files_path}/temp/first_last_scene_frames/frame_{first_frame_of_scene}.png",
-                        mode="tc",
-                    )
-                    first_frame_tc = self.tc_cleanup_from_potential_errors(
-                        tc_text=first_frame_tc,
-                        frame_number=first_frame_of_scene,
-                    )
-                except FileNotFoundError as e:
-                    frames_not_found.append(first_frame_of_scene)
-                    logging.exception(
-                        f"Error with frame {first_frame_of_scene}:\n %s",
-                        e,
-                    )
-                try:
-                    self.generate_processed_pictures(
-                        right_last_image, last_frame_of_scene
-                    )
-                    last_frame_tc = self.read_text_from_image(
-                        f"{self.files_path}/temp/first_last_scene_frames/frame_{last_frame_of_scene}.png",
-                        mode="tc",
-                    )
-                    last_frame_tc = self.tc_cleanup_from_potential_errors(
-                        tc_text=last_frame_tc,
-                        frame_number=last_frame_of_scene,
-                    )
-                    tc_out = self.read_tc_add_one_frame(last_frame_tc)
-                except FileNotFoundError as e:
-                    frames_not_found.append(last_frame_of_scene)
-                    logging.exception(
-                        f"Error with frame {last_frame_of_scene}:\n %s",
-                        e,
-                    )
-                    tc_out = last_frame_tc
-                except ValueError as e:
-                    logging.exception(
-                        f"Error with frame {last_frame_of_scene}:\n %s",
-                        e,
-                    )
-                    tc_out = last_frame_tc
-                if first_frame_of_scene not in found_vfx_text:
-                    found_vfx_text[first_frame_of_scene] = {}
-                    found_vfx_text[first_frame_of_scene][
-                        "TEXT"
-                    ] = most_probable_text
-                    found_vfx_text[first_frame_of_scene][
-                        "TC IN"
-                    ] = first_frame_tc
-                    found_vfx_text[first_frame_of_scene]["TC OUT"] = tc_out
-                    found_vfx_text[first_frame_of_scene]["FRAME OUT"] = (
-                        frame_range[1]
+                if text_found_in_a_range:
+                    most_probable_text = self.construct_most_common_word(
+                        text_found_in_a_range
                     )
+                    # found_vfx_flag = True
+                    first_frame_of_scene = frame_range[0]
+                    last_frame_of_scene = frame_range[1] - 1
+
+                    # TODO: Program should check if both frames
+                    # don't exist already.
+                    right_first_image = f"{self.files_path}/temp/first_last_scene_frames/{first_frame_of_scene}.png"
+                    right_last_image = f"{self.files_path}/temp/first_last_scene_frames/{last_frame_of_scene}.png"
+                    try:
+                        # Generates processed pictures in case the
+                        # person that crated the video by chance
+                        # added the text later in the scene or
+                        # removed it before the scene ends.
+                        # That way, knowing that there is the text
+                        # in the scene, we can check and read TC
+                        # from the correct images.
+                        self.generate_processed_pictures(
+                            right_first_image, first_frame_of_scene
+                        )
+                        first_frame_tc = self.read_text_from_image(
+                            f"{self.files_path}/temp/first_last_scene_frames/frame_{first_frame_of_scene}.png",
+                            mode="tc",
+                        )
+                        first_frame_tc = self.tc_cleanup_from_potential_errors(
+                            tc_text=first_frame_tc,
+                            frame_number=first_frame_of_scene,
+                        )
+                    except FileNotFoundError as e:
+                        frames_not_found.append(first_frame_of_scene)
+                        logging.exception(
+                            f"Error with frame {first_frame_of_scene}:\n %s",
+                            e,
+                        )
+                    try:
+                        self.generate_processed_pictures(
+                            right_last_image, last_frame_of_scene
+                        )
+                        last_frame_tc = self.read_text_from_image(
+                            f"{self.files_path}/temp/first_last_scene_frames/frame_{last_frame_of_scene}.png",
+                            mode="tc",
+                        )
+                        last_frame_tc = self.tc_cleanup_from_potential_errors(
+                            tc_text=last_frame_tc,
+                            frame_number=last_frame_of_scene,
+                        )
+                        tc_out = self.read_tc_add_one_frame(last_frame_tc)
+                    except FileNotFoundError as e:
+                        frames_not_found.append(last_frame_of_scene)
+                        logging.exception(
+                            f"Error with frame {last_frame_of_scene}:\n %s",
+                            e,
+                        )
+                        tc_out = last_frame_tc
+                    except ValueError as e:
+                        logging.exception(
+                            f"Error with frame {last_frame_of_scene}:\n %s",
+                            e,
+                        )
+                        tc_out = last_frame_tc
+                    if first_frame_of_scene not in found_vfx_text:
+                        found_vfx_text[first_frame_of_scene] = {
+                            "TEXT": most_probable_text,
+                            "TC IN": first_frame_tc,
+                            "TC OUT": tc_out,
+                            "FRAME OUT": frame_range[1],
+                        }
         if frames_not_found:
             print(
                 f"Couldn't find frames: {str(frames_not_found)[1:-1]}. Search"
@@ -582,6 +777,7 @@ class TextRecognition:
     def check_previous_or_next_frames(
         self,
         frames_to_check: List[int],
+        frame_positions: Dict[int, int],
         frame: int,
         found_adr_text: Dict[int, Dict[str, str]],
         mode: str,
@@ -594,6 +790,9 @@ class TextRecognition:
             frames_to_check (List[int]):
                 List of frame numbers with embedded text.
 
+            frame_positions (Dict[int, int]):
+                Position of each frame number in frames_to_check.
+
             frame (int): Frame number.
 
             found_adr_text (Dict[int, Dict[str, str]]):
@@ -605,15 +804,18 @@ class TextRecognition:
             Dict[int, Dict[str, str]]: Dictionary with the results.
             int, optional: New index.
         """
-        index = frames_to_check.index(frame)
+        index = frame_positions[frame]
+        # Walks the positions instead of copying a slice of the list
         if mode == "previous":
-            sliced_list = frames_to_check[index - 1 :: -1]
+            positions = range(index - 1, -1, -1)
         elif mode == "next":
-            sliced_list = frames_to_check[index + 1 :]
+            positions = range(index + 1, len(frames_to_check))
         boundry = False
         last_frame = None
+        position = index
         # Only check for text in consecutive frames
-        for curr_frame in sliced_list:
+        for position in positions:
+            curr_frame = frames_to_check[position]
             if last_frame is not None:
                 if abs(curr_frame - last_frame) > 1:
                     break
@@ -641,17 +843,17 @@ class TextRecognition:
                         )
                         frame_tc = "WRONG TC"
                     if curr_frame not in found_adr_text:
-                        found_adr_text[curr_frame] = {}
-                        found_adr_text[curr_frame]["TEXT"] = matched_text
-                        found_adr_text[curr_frame]["TC"] = frame_tc
+                        found_adr_text[curr_frame] = {
+                            "TEXT": matched_text,
+                            "TC": frame_tc,
+                        }
             # Text can hold multiple values
             # If not one of the values is ADR, break the loop
             if not found_any_adr:
                 boundry = True
             last_frame = curr_frame
         if mode == "next":
-            new_index = frames_to_check.index(curr_frame)
-            return found_adr_text, new_index
+            return found_adr_text, position
         else:
             return found_adr_text
 
@@ -668,6 +870,10 @@ class TextRecognition:
             Dict[int, Dict[str, str]]: Dictionary with the results.
         """
         frames_to_check = frames_with_embedded_text_id.copy()
+        # Saves scanning frames_to_check for every found ADR frame
+        frame_positions = {
+            frame: position for position, frame in enumerate(frames_to_check)
+        }
         found_adr_text: Dict[int, Dict[str, str]] = {}
         print("\n-Searching for ADR text-")
         # for frame in tqdm(
@@ -683,60 +889,91 @@ class TextRecognition:
             ascii=" █",
         )
         i = 0
-        while i < len(frames_to_check):
-            frame = frames_to_check[i]
-            left_image = f"{self.files_path}/temp/text_imgs/frame_{frame}.png"
-            text = self.read_text_from_image(left_image, mode="text")
-            # If empty text, continue to the next frame
-            if not text:
-                i += 15
-                pbar.update(15)
-                continue
-            returning_from_next_boundry = False
-            for line in text[0]:
-                matched_text = self.match_text(line, beginning_chars="ADR")
-                if matched_text:
-                    right_image = (
-                        f"{self.files_path}/temp/tc_imgs/frame_{frame}.png"
+        # The next frame is read ahead while the current one is checked.
+        # The loop moves on by 15 frames unless it finds ADR text,
+        # then the read ahead text is dropped.
+        text_ahead = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while i < len(frames_to_check):
+                frame = frames_to_check[i]
+                if text_ahead is not None and text_ahead[0] == i:
+                    text = text_ahead[1].result()
+                else:
+                    left_image = (
+                        f"{self.files_path}/temp/text_imgs/frame_{frame}.png"
                     )
-                    frame_tc = self.read_text_from_image(
-                        right_image, mode="tc"
+                    text = self.read_text_from_image(left_image, mode="text")
+                text_ahead = None
+                if i + 15 < len(frames_to_check):
+                    next_image = (
+                        f"{self.files_path}/temp/text_imgs/"
+                        f"frame_{frames_to_check[i + 15]}.png"
                     )
-                    try:
-                        frame_tc = self.tc_cleanup_from_potential_errors(
-                            tc_text=frame_tc, frame_number=frame
+                    text_ahead = (
+                        i + 15,
+                        executor.submit(
+                            self.read_text_from_image, next_image, mode="text"
+                        ),
+                    )
+                # If empty text, continue to the next frame
+                if not text:
+                    i += 15
+                    pbar.update(15)
+                    continue
+                returning_from_next_boundry = False
+                for line in text[0]:
+                    matched_text = self.match_text(
+                        line, beginning_chars="ADR"
+                    )
+                    if matched_text:
+                        right_image = (
+                            f"{self.files_path}/temp/tc_imgs/frame_{frame}.png"
                         )
-                    except ValueError as e:
-                        logging.exception(f"Error with frame {frame}:\n %s", e)
-                        frame_tc = "WRONG TC"
-                    if frame not in found_adr_text:
-                        found_adr_text[frame] = {}
-                        found_adr_text[frame]["TEXT"] = matched_text
-                        found_adr_text[frame]["TC"] = frame_tc
-                        previous_frames = self.check_previous_or_next_frames(
-                            frames_to_check,
-                            frame,
-                            found_adr_text,
-                            mode="previous",
+                        frame_tc = self.read_text_from_image(
+                            right_image, mode="tc"
                         )
-                        next_frames, new_index = (
-                            self.check_previous_or_next_frames(
-                                frames_to_check,
-                                frame,
-                                found_adr_text,
-                                mode="next",
+                        try:
+                            frame_tc = self.tc_cleanup_from_potential_errors(
+                                tc_text=frame_tc, frame_number=frame
                             )
-                        )
-                        returning_from_next_boundry = True
-                        i = new_index + 15
-                        diff = abs(new_index - i)
-                        pbar.update(diff + 15)
-                        found_adr_text.update(
-                            {**previous_frames, **next_frames}
-                        )
-            if not returning_from_next_boundry:
-                i += 15
-                pbar.update(15)
+                        except ValueError as e:
+                            logging.exception(
+                                f"Error with frame {frame}:\n %s", e
+                            )
+                            frame_tc = "WRONG TC"
+                        if frame not in found_adr_text:
+                            found_adr_text[frame] = {
+                                "TEXT": matched_text,
+                                "TC": frame_tc,
+                            }
+                            previous_frames = (
+                                self.check_previous_or_next_frames(
+                                    frames_to_check,
+                                    frame_positions,
+                                    frame,
+                                    found_adr_text,
+                                    mode="previous",
+                                )
+                            )
+                            next_frames, new_index = (
+                                self.check_previous_or_next_frames(
+                                    frames_to_check,
+                                    frame_positions,
+                                    frame,
+                                    found_adr_text,
+                                    mode="next",
+                                )
+                            )
+                            returning_from_next_boundry = True
+                            i = new_index + 15
+                            diff = abs(new_index - i)
+                            pbar.update(diff + 15)
+                            found_adr_text.update(
+                                {**previous_frames, **next_frames}
+                            )
+                if not returning_from_next_boundry:
+                    i += 15
+                    pbar.update(15)
         # pbar.update(1)
         sorted_dict = {k: found_adr_text[k] for k in sorted(found_adr_text)}
         found_adr_text = self.remove_all_but_border_cases_found(sorted_dict)
@@ -756,47 +993,39 @@ class TextRecognition:
         Returns:
             Dict[int, Dict[str, str]]: Dictionary with the results.
         """
-        keys_series = []
-        first_and_last_key = []
         new_adr_dict = {}
-        for i in text_dict.keys():
-            # if the keys_series is empty or the element is consecutive
-            if (not keys_series) or (keys_series[-1] == i - 1):
-                keys_series.append(i)
-            else:
-                # append a tuple of the first and last item of the keys_series
-                first_and_last_key.append((keys_series[0], keys_series[-1]))
-                keys_series = [i]
-        # needed in case keys_series is empty
-        if keys_series:
-            first_and_last_key.append((keys_series[0], keys_series[-1]))
-        for ranges in first_and_last_key:
+        if not text_dict:
+            return new_adr_dict
+        # Materialized once, runs are taken out of these by position
+        keys = list(text_dict)
+        details_list = list(text_dict.values())
+        texts = [details["TEXT"] for details in details_list]
+        # A run of consecutive keys breaks wherever the keys jump
+        run_breaks = (
+            np.flatnonzero(np.diff(np.array(keys, dtype=np.int64)) != 1) + 1
+        ).tolist()
+        for run_start, run_end in zip(
+            [0] + run_breaks, run_breaks + [len(keys)]
+        ):
+            first_key = keys[run_start]
+            last_key = keys[run_end - 1]
+            text_values = texts[run_start:run_end]
+            last_tc = details_list[run_end - 1]["TC"]
             try:
-                tc_out = self.read_tc_add_one_frame(text_dict[ranges[1]]["TC"])
+                tc_out = self.read_tc_add_one_frame(last_tc)
             except ValueError as e:
                 logging.exception(
                     "Error with frame",
                     e,
                 )
-                tc_out = text_dict[ranges[1]]["TC"]
-            # Temp dictionary with specific ADR text found
-            # temp_dict = {
-            #     key: value
-            #     for key, value in text_dict.items()
-            #     if ranges[0] <= key <= ranges[1]
-            # }
-            # text_values = [details["TEXT"] for details in temp_dict.values()]
-            text_values = [
-                details["TEXT"]
-                for key, details in text_dict.items()
-                if ranges[0] <= key <= ranges[1]
-            ]
+                tc_out = last_tc
             most_probable_text = self.construct_most_common_word(text_values)
-            new_adr_dict[ranges[0]] = {}
-            new_adr_dict[ranges[0]]["TEXT"] = most_probable_text
-            new_adr_dict[ranges[0]]["TC IN"] = text_dict[ranges[0]]["TC"]
-            new_adr_dict[ranges[0]]["TC OUT"] = tc_out
-            new_adr_dict[ranges[0]]["FRAME OUT"] = ranges[1] + 1
+            new_adr_dict[first_key] = {
+                "TEXT": most_probable_text,
+                "TC IN": details_list[run_start]["TC"],
+                "TC OUT": tc_out,
+                "FRAME OUT": last_key + 1,
+            }
         return new_adr_dict
 
     def construct_most_common_word(
@@ -814,14 +1043,14 @@ class TextRecognition:
         Returns:
             str: Most common word constructed from the text dictionary.
         """
-        max_length = max(len(s) for s in text_values)
-        padded_strings = [s.ljust(max_length) for s in text_values]
         result_string = ""
-        transposed_list = zip(*padded_strings)
+        # Shorter texts are padded with spaces while transposing
+        transposed_list = zip_longest(*text_values, fillvalue=" ")
 
         for characters in transposed_list:
-            most_common_char, _ = Counter(characters).most_common(1)[0]
-            result_string += most_common_char
+            # Same pick as most_common(1), without going through heapq
+            char_counts = Counter(characters)
+            result_string += max(char_counts, key=char_counts.__getitem__)
 
         return result_string.rstrip()
 
@@ -842,20 +1071,19 @@ class TextRecognition:
         Returns:
             Dict[int, Dict[str, str]]: Dictionary with the results.
         """
-        merge_result: Dict[int, Dict[str, str]] = {}
-        for key in dict_a:
-            if key in dict_b:
-                merge_result[key] = {
+        # Filled in key order, so the result needs no sorting afterwards
+        sorted_results: Dict[int, Dict[str, str]] = {}
+        for key in sorted(dict_a.keys() | dict_b.keys()):
+            if key not in dict_b:
+                sorted_results[key] = dict_a[key]
+            elif key not in dict_a:
+                sorted_results[key] = dict_b[key]
+            else:
+                sorted_results[key] = {
                     "text": [dict_a[key]["text"], dict_b[key]["text"]],
                     "TC IN": dict_a[key]["TC IN"],
                     "TC OUT": [dict_a[key]["TC OUT"], dict_b[key]["TC OUT"]],
                 }
-            else:
-                merge_result[key] = dict_a[key]
-        for key in dict_b:
-            if key not in dict_a:
-                merge_result[key] = dict_b[key]
-        sorted_results = dict(sorted(merge_result.items()))
         return sorted_results
 
     def add_real_timestamps(
@@ -871,20 +1099,57 @@ class TextRecognition:
         Returns:
             Dict[int, Dict[str, str]]: Dictionary with the results.
         """
-        for frame_number in frames_dict.keys():
-            real_tc_in = self.convert_current_frame_to_tc(frame_number)
-            real_tc_out = self.convert_current_frame_to_tc(
-                frames_dict[frame_number]["FRAME OUT"]
-            )
-            frames_dict[frame_number]["REAL TC IN"] = real_tc_in
-            frames_dict[frame_number]["REAL TC OUT"] = real_tc_out
+        frames_in = np.fromiter(
+            frames_dict.keys(), dtype=np.int64, count=len(frames_dict)
+        )
+        frames_out = np.fromiter(
+            (details["FRAME OUT"] for details in frames_dict.values()),
+            dtype=np.int64,
+            count=len(frames_dict),
+        )
+        real_tcs_in = self.convert_frames_to_tc(frames_in)
+        real_tcs_out = self.convert_frames_to_tc(frames_out)
+        for details, real_tc_in, real_tc_out in zip(
+            frames_dict.values(), real_tcs_in, real_tcs_out
+        ):
+            details["REAL TC IN"] = real_tc_in
+            details["REAL TC OUT"] = real_tc_out
         self.close_cap()
         return frames_dict
 
+    def convert_frames_to_tc(self, frame_numbers: np.ndarray) -> List[str]:
+        """Converts an array of frame numbers to time codes at once.
+
+        Vectorized counterpart of convert_current_frame_to_tc.
+
+        Args:
+            frame_numbers (np.ndarray): Frame numbers.
+
+        Returns:
+            List[str]: Time codes in format HH:MM:SS:FF.
+        """
+        fps = int(self.video_fps)
+        total_seconds, frames = np.divmod(frame_numbers, fps)
+        total_minutes, seconds = np.divmod(total_seconds, 60)
+        hours, minutes = np.divmod(total_minutes, 60)
+        # Every field is looked up in one table of zero padded numbers
+        # instead of being formatted for each time code
+        table_size = max(fps, 60, int(hours.max(initial=0)) + 1)
+        padded = [f"{number:02d}" for number in range(table_size)]
+        return [
+            ":".join((padded[h], padded[m], padded[s], padded[f]))
+            for h, m, s, f in zip(
+                hours.tolist(),
+                minutes.tolist(),
+                seconds.tolist(),
+                frames.tolist(),
+            )
+        ]
+
     def close_cap(self):
-        """Close the video capture object and destroy all windows."""
+        """Close the video capture object."""
+        # Nothing here opens HighGUI windows, so there are none to destroy
         self.cap.release()
-        cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
@@ -73,7 +73,7 @@ def create_xlsx_file(
         if dataframe.iloc[index]["TEXT"].startswith("VFX"):
             worksheet.insert_image(
                 f"B{pic_row}",
-                f"{file_save_dir}/temp/thumbnails/{dataframe.iloc[index]['FRAME IN']}.png",
+                f"{file_save_dir}/temp/thumbnails/{dataframe.iloc[index]['FRAME IN']}.jpg",
             )
             if save_hq_pics:
                 source_path = (